@@ -6,22 +6,46 @@ A command-line tool that creates SSE or HTTP MCP servers from OpenAPI specificat
 with support for various authentication methods and Cursor compatibility.
 """
 
-import json
+from __future__ import annotations
+
+import asyncio
+import functools
 import logging
+import mmap
+import re
+import ssl
+import stat
 import sys
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Union
 from urllib.parse import urlparse
 
 import click
-import httpx
-import yaml
 from dotenv import load_dotenv
-from fastmcp import FastMCP
-from fastmcp.server.openapi import RouteMap, MCPType
 
-from .route_maps import create_route_maps_from_filters, validate_filter_options
+# orjson parses buffers (memoryview) in place; stdlib json only accepts str/bytes
+try:
+    import orjson as _json
+    _JSON_ACCEPTS_BUFFER = True
+except ImportError:
+    import json as _json
+    _JSON_ACCEPTS_BUFFER = False
+
+from .route_maps import (
+    HTTP_METHODS,
+    create_route_maps_from_filters,
+    get_routing_types,
+    parse_comma_separated,
+    validate_filter_options,
+)
+from .spec_cache import file_validator, load_cached_spec, store_cached_spec
+
+# fastmcp, httpx and yaml are imported where used to keep CLI startup (and --help) fast
+if TYPE_CHECKING:
+    import httpx
+    from fastmcp import FastMCP
+    from fastmcp.server.openapi import RouteMap
 
 # Load environment variables
 load_dotenv()
@@ -30,35 +54,145 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_FIRST_NON_WHITESPACE = re.compile(rb"\S")
+_HEADER_SEPARATOR = re.compile(r"\s*:\s*")
+
+# Timeout (seconds) shared by the spec fetch, the API client and FastMCP tool calls
+HTTP_TIMEOUT = 30.0
+
+# Built once on first use (fastmcp is imported lazily), per active parser's RouteMap class
+_TOOLS_ONLY_ROUTE_MAPS: Dict[type, List[RouteMap]] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def get_ssl_context() -> ssl.SSLContext:
+    """Return the SSL context shared by every outbound httpx client in this process."""
+    import httpx
+    
+    # Built once, so the CA bundle is loaded a single time for the spec fetch and API calls
+    return httpx.create_ssl_context()
+
+
+def _load_yaml(content):
+    """Parse YAML content, preferring the libyaml-backed loader when available."""
+    import yaml
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    return yaml.load(content, Loader=Loader)
+
+
+def _load_json(content: Union[bytes, mmap.mmap]) -> Any:
+    """Parse JSON content; a memory-mapped file is read in place by orjson."""
+    if isinstance(content, mmap.mmap):
+        with memoryview(content) as view:
+            return _json.loads(view if _JSON_ACCEPTS_BUFFER else view.tobytes())
+    return _json.loads(content)
+
+
+def _looks_like_json(content: Union[bytes, mmap.mmap]) -> bool:
+    """Check whether the first non-whitespace byte opens a JSON object or array."""
+    match = _FIRST_NON_WHITESPACE.search(content)
+    return match is not None and match.group() in (b'{', b'[')
+
+
+def _parse_spec(content: Union[bytes, mmap.mmap]) -> Dict[str, Any]:
+    """Parse raw spec content (bytes or a memory-mapped file) as JSON or YAML."""
+    # Dispatch on the first byte so each document is tokenized once and JSON never loads yaml
+    spec = _load_json(content) if _looks_like_json(content) else _load_yaml(content)
+    if not isinstance(spec, dict):
+        raise ValueError("OpenAPI spec is empty or invalid: expected a JSON/YAML object at the top level")
+    return spec
+
+
+def _parse_spec_file(file_path: Path) -> Dict[str, Any]:
+    """Parse a local spec file through a read-only memory map instead of reading it into memory."""
+    with file_path.open('rb') as f:
+        # Only non-empty regular files can be mapped; pipes, FIFOs and /proc files report size 0
+        st = os.fstat(f.fileno())
+        if not (stat.S_ISREG(st.st_mode) and st.st_size > 0):
+            return _parse_spec(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _parse_spec(mm)
+
+
+def _resolve_refs(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Inline all $ref pointers once so FastMCP does not re-resolve them."""
+    try:
+        import jsonref
+    except ImportError:
+        raise RuntimeError(
+            "--resolve-refs requires jsonref; install it with: pip install 'openapi-mcp-server[refs]'"
+        ) from None
+    
+    return jsonref.replace_refs(spec, lazy_load=False, proxies=False)
+
 
-def load_openapi_spec(source: str) -> Dict[str, Any]:
+def _url_validator(client: httpx.Client, source: str) -> Optional[str]:
+    """Return the ETag or Last-Modified header of a spec URL, if any, for cache freshness."""
+    import httpx
+    try:
+        response = client.head(source)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.debug("HEAD request for %s failed, not caching: %s", source, e)
+        return None
+    return response.headers.get('etag') or response.headers.get('last-modified')
+
+
+def load_openapi_spec(source: str, use_cache: bool = True, resolve_refs: bool = False) -> Dict[str, Any]:
     """Load OpenAPI specification from file path or URL."""
     parsed = urlparse(source)
     is_url = parsed.scheme in ('http', 'https')
+    client = None
     
     try:
         if is_url:
             click.echo(f"📡 Fetching OpenAPI spec from: {source}", err=True)
-            response = httpx.get(source, timeout=30.0)
-            response.raise_for_status()
-            content = response.text
+            import httpx
+            
+            # One HTTP/2 client for the HEAD and GET so both share a connection
+            client = httpx.Client(http2=True, timeout=HTTP_TIMEOUT, verify=get_ssl_context())
+            cache_source = source
+            validator = _url_validator(client, source) if use_cache else None
         else:
             file_path = Path(source)
             if not file_path.exists():
                 raise FileNotFoundError(f"File not found: {source}")
             
             click.echo(f"📄 Loading OpenAPI spec from: {source}", err=True)
-            content = file_path.read_text()
+            cache_source = str(file_path.resolve())
+            validator = file_validator(file_path) if use_cache else None
+        
+        # Entries with resolved refs differ from plain ones, so the flag is part of the validator
+        cache_validator = (validator, resolve_refs) if validator else None
+        if cache_validator:
+            cached_spec = load_cached_spec(cache_source, cache_validator)
+            if cached_spec is not None:
+                click.echo("♻️  Using cached OpenAPI spec", err=True)
+                return cached_spec
         
         # Parse as JSON or YAML
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            return yaml.safe_load(content)
+        if is_url:
+            response = client.get(source)
+            response.raise_for_status()
+            spec = _parse_spec(response.content)
+        else:
+            spec = _parse_spec_file(file_path)
+        
+        if resolve_refs:
+            spec = _resolve_refs(spec)
+        if cache_validator:
+            store_cached_spec(cache_source, cache_validator, spec)
+        return spec
             
     except Exception as e:
         click.echo(f"❌ Error loading OpenAPI spec: {e}", err=True)
         sys.exit(1)
+    finally:
+        if client is not None:
+            client.close()
 
 
 def create_http_client(
@@ -74,21 +208,22 @@ def create_http_client(
     custom_headers: Optional[Dict[str, str]] = None,
 ) -> httpx.AsyncClient:
     """Create HTTP client with authentication and custom headers."""
+    import httpx
+    
     headers = {}
     auth = None
-    event_hooks = None
+    event_hooks = {}
     
     if auth_type == "api_key" and api_key:
         if api_key_location == "header":
             headers[api_key_header] = api_key
         elif api_key_location == "query":
+            # A request hook (not client-level params) so the key is also applied when FastMCP
+            # builds requests itself and calls client.send(); merging overwrites any existing value
             async def _append_query_auth(request: httpx.Request) -> None:
-                params_dict = dict(request.url.params)
-                # Overwrite existing value to ensure consistency
-                params_dict[api_key_param_name] = api_key  # type: ignore[index]
-                request.url = request.url.copy_with(params=httpx.QueryParams(params_dict))
+                request.url = request.url.copy_merge_params({api_key_param_name: api_key})
 
-            event_hooks = {"request": [_append_query_auth]}
+            event_hooks["request"] = [_append_query_auth]
     elif auth_type == "bearer" and bearer_token:
         headers["Authorization"] = f"Bearer {bearer_token}"
     elif auth_type == "basic" and username and password:
@@ -97,24 +232,55 @@ def create_http_client(
     if custom_headers:
         headers.update(custom_headers)
     
+    # Pool settings go on the client (no custom transport) so env proxies are still mounted
     return httpx.AsyncClient(
         base_url=base_url,
         auth=auth,
         headers=headers,
-        timeout=30.0,
-        event_hooks=event_hooks or {}
+        timeout=HTTP_TIMEOUT,
+        event_hooks=event_hooks,
+        verify=get_ssl_context(),
+        http2=True,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30.0)
     )
 
 
 def create_tools_only_route_maps() -> List[RouteMap]:
     """Create route maps that force ALL endpoints to become Tools (not Resources)."""
-    return [
-        RouteMap(
-            methods=["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"],
-            pattern=r".*",
-            mcp_type=MCPType.TOOL
-        )
-    ]
+    RouteMap, MCPType = get_routing_types()
+    
+    route_maps = _TOOLS_ONLY_ROUTE_MAPS.get(RouteMap)
+    if route_maps is None:
+        route_maps = _TOOLS_ONLY_ROUTE_MAPS[RouteMap] = [
+            RouteMap(
+                methods=list(HTTP_METHODS),
+                pattern=re.compile(r".*"),
+                mcp_type=MCPType.TOOL
+            )
+        ]
+    return route_maps
+
+
+def configure_openapi_parser(fast_parser: bool) -> None:
+    """Toggle FastMCP's single-pass OpenAPI parser where the installed version supports it."""
+    import fastmcp
+    
+    experimental = getattr(fastmcp.settings, 'experimental', None)
+    if experimental is None or not hasattr(experimental, 'enable_new_openapi_parser'):
+        logger.debug("Installed FastMCP has no experimental OpenAPI parser setting")
+        return
+    experimental.enable_new_openapi_parser = fast_parser
+
+
+def install_uvloop() -> None:
+    """Use uvloop as the asyncio event loop for network transports when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+        return
+    # uvloop.install() is deprecated (warns on Python 3.12+); set the policy directly
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 def validate_auth_params(auth_type: str, **auth_kwargs) -> None:
@@ -157,9 +323,10 @@ def parse_custom_headers(header_tuples: tuple) -> Dict[str, str]:
     """Parse custom headers from CLI tuple."""
     headers = {}
     for header_str in header_tuples:
-        if ':' in header_str:
-            name, value = header_str.split(':', 1)
-            headers[name.strip()] = value.strip()
+        # Splitting on the padded separator trims both sides in a single pass
+        parts = _HEADER_SEPARATOR.split(header_str.strip(), maxsplit=1)
+        if len(parts) == 2:
+            headers[parts[0]] = parts[1]
         else:
             click.echo(f"⚠️  Invalid header format: {header_str}", err=True)
     return headers
@@ -172,6 +339,8 @@ def create_mcp_server(
     **auth_kwargs
 ) -> FastMCP:
     """Create FastMCP server from OpenAPI specification."""
+    from fastmcp import FastMCP
+    
     base_url = auth_kwargs.pop('base_url', None)
     if not base_url:
         servers = openapi_spec.get("servers", [])
@@ -188,7 +357,7 @@ def create_mcp_server(
         name=server_name,
         openapi_spec=openapi_spec,
         client=http_client,
-        timeout=30.0,
+        timeout=HTTP_TIMEOUT,
         route_maps=final_route_maps
     )
 
@@ -200,6 +369,12 @@ def create_mcp_server(
 @click.option('--port', default=8000, help='Port to bind the server to')
 @click.option('--base-url', help='Override base URL for API requests')
 @click.option('--debug', is_flag=True, help='Enable debug logging')
+@click.option('--cache/--no-cache', default=True, help='Cache parsed OpenAPI specs on disk (default: enabled)')
+@click.option('--fast-parser/--no-fast-parser', default=None,
+              help="Use FastMCP's experimental single-pass OpenAPI parser when available "
+                   "(default: FastMCP's own setting, normally the legacy parser)")
+@click.option('--resolve-refs', is_flag=True,
+              help='Inline $ref pointers before building tools (not for specs with recursive schemas)')
 # Transport option
 @click.option('-t', '--server-type',
               type=click.Choice(['sse', 'http', 'stdio']),
@@ -256,6 +431,9 @@ def cli(
     port: int,
     base_url: Optional[str],
     debug: bool,
+    cache: bool,
+    fast_parser: Optional[bool],
+    resolve_refs: bool,
     server_type: str,
     auth_type: str,
     api_key: Optional[str],
@@ -302,9 +480,12 @@ def cli(
     # Parse custom headers
     custom_headers = parse_custom_headers(header)
     
+    # Parse methods once for both validation and route map creation
+    method_list = parse_comma_separated(methods, str.upper)
+    
     # Validate filter options
-    filter_errors = validate_filter_options(
-        methods=methods,
+    filter_errors, path_patterns = validate_filter_options(
+        methods=method_list,
         include_paths=include_paths,
         exclude_paths=exclude_paths,
         include_tags=include_tags,
@@ -317,16 +498,20 @@ def cli(
         sys.exit(1)
     
     # Load OpenAPI spec
-    openapi_spec = load_openapi_spec(openapi_source)
+    openapi_spec = load_openapi_spec(openapi_source, use_cache=cache, resolve_refs=resolve_refs)
+    
+    # Select the OpenAPI parser before any RouteMap is built, as each parser has its own types.
+    # The experimental parser is opt-in; without the flag FastMCP's own setting is left alone.
+    if fast_parser is not None:
+        configure_openapi_parser(fast_parser)
     
     # Create route maps for filtering
     route_maps = None
-    if any([methods, include_paths, exclude_paths, include_tags, exclude_tags]):
+    if methods or include_paths or exclude_paths or include_tags or exclude_tags:
         try:
             route_maps = create_route_maps_from_filters(
-                methods=methods,
-                include_paths=include_paths,
-                exclude_paths=exclude_paths,
+                methods=method_list,
+                path_patterns=path_patterns,
                 include_tags=include_tags,
                 exclude_tags=exclude_tags,
             )
@@ -357,6 +542,7 @@ def cli(
         if server_type == 'sse':
             click.echo(f"🌐 Starting SSE MCP server at http://{host}:{port}", err=True)
             click.echo(f"📡 MCP endpoint: http://{host}:{port}/sse", err=True)
+            install_uvloop()
             mcp.run(
                 transport='sse',
                 host=host,
@@ -366,6 +552,7 @@ def cli(
         elif server_type == 'http':
             click.echo(f"🌐 Starting HTTP MCP server at http://{host}:{port}", err=True)
             click.echo(f"📡 MCP endpoint: http://{host}:{port}", err=True)
+            install_uvloop()
             mcp.run(
                 transport='http',
                 host=host,
@@ -5,12 +5,32 @@ This module provides functions to convert CLI filter options into FastMCP RouteM
 for filtering OpenAPI operations based on methods, patterns, and tags.
 """
 
+from __future__ import annotations
+
 import re
-from typing import List, Optional, Set
-from fastmcp.server.openapi import RouteMap, MCPType
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from fastmcp.server.openapi import RouteMap
+
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+_VALID_METHODS = frozenset(HTTP_METHODS)
+
+
+def get_routing_types():
+    """Return the RouteMap and MCPType classes matching FastMCP's active OpenAPI parser."""
+    import fastmcp
+    
+    # The experimental parser ships its own RouteMap/MCPType, which the legacy ones don't match
+    experimental = getattr(fastmcp.settings, 'experimental', None)
+    if getattr(experimental, 'enable_new_openapi_parser', False):
+        from fastmcp.experimental.server.openapi import RouteMap, MCPType
+    else:
+        from fastmcp.server.openapi import RouteMap, MCPType
+    return RouteMap, MCPType
 
 
-def _parse_comma_separated(value: Optional[str], transform=None) -> Optional[List[str]]:
+def parse_comma_separated(value: Optional[str], transform=None) -> Optional[List[str]]:
     """Parse comma-separated string into list, with optional transformation."""
     if not value:
         return None
@@ -19,9 +39,8 @@ def _parse_comma_separated(value: Optional[str], transform=None) -> Optional[Lis
 
 
 def create_route_maps_from_filters(
-    methods: Optional[str] = None,
-    include_paths: Optional[str] = None,
-    exclude_paths: Optional[str] = None,
+    methods: Optional[List[str]] = None,
+    path_patterns: Optional[Dict[str, re.Pattern]] = None,
     include_tags: Optional[str] = None,
     exclude_tags: Optional[str] = None,
 ) -> Optional[List[RouteMap]]:
@@ -29,41 +48,41 @@ def create_route_maps_from_filters(
     Convert CLI filter options to FastMCP RouteMap objects.
     
     Args:
-        methods: Comma-separated HTTP methods (e.g., "GET,POST,PUT")
-        include_paths: Comma-separated regex patterns to include (e.g., "/api/.*,/users/.*")
-        exclude_paths: Comma-separated regex patterns to exclude (e.g., "/admin/.*,/internal/.*")
+        methods: Upper-cased HTTP methods parsed from the CLI (e.g., ["GET", "POST"])
+        path_patterns: Compiled "include"/"exclude" path patterns from validate_filter_options
         include_tags: Comma-separated tags to include (e.g., "public,user")
         exclude_tags: Comma-separated tags to exclude (e.g., "admin,internal")
         
     Returns:
         List of RouteMap objects for FastMCP filtering, or None if no filters
     """
+    RouteMap, MCPType = get_routing_types()
+    
     route_maps = []
     
-    # Parse all filter options
-    method_list = _parse_comma_separated(methods, str.upper)
-    include_path_list = _parse_comma_separated(include_paths)
-    exclude_path_list = _parse_comma_separated(exclude_paths)
-    include_tags_set = set(_parse_comma_separated(include_tags) or [])
-    exclude_tags_set = set(_parse_comma_separated(exclude_tags) or [])
+    # Parse remaining filter options
+    path_patterns = path_patterns or {}
+    include_pattern = path_patterns.get("include")
+    exclude_pattern = path_patterns.get("exclude")
+    include_tags_set = set(parse_comma_separated(include_tags) or [])
+    exclude_tags_set = set(parse_comma_separated(exclude_tags) or [])
     
     # Create include route map (if any include filters are specified)
-    if any([method_list, include_path_list, include_tags_set]):
+    if methods or include_pattern or include_tags_set:
         kwargs = {'mcp_type': MCPType.TOOL}
         
-        if method_list:
-            kwargs['methods'] = method_list
-        if include_path_list:
-            kwargs['pattern'] = _combine_patterns(include_path_list)
+        if methods:
+            kwargs['methods'] = methods
+        if include_pattern:
+            kwargs['pattern'] = include_pattern
         if include_tags_set:
             kwargs['tags'] = include_tags_set
             
         route_maps.append(RouteMap(**kwargs))
     
     # Create exclusion route maps for unwanted HTTP methods
-    if method_list:
-        all_methods = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
-        excluded_methods = all_methods - set(method_list)
+    if methods:
+        excluded_methods = _VALID_METHODS - set(methods)
         for method in excluded_methods:
             route_maps.append(RouteMap(
                 methods=[method],
@@ -71,13 +90,14 @@ def create_route_maps_from_filters(
                 mcp_type=MCPType.EXCLUDE
             ))
     
-    # Create exclude route maps
-    for pattern in exclude_path_list or []:
+    # Create a single exclude route map matching any of the excluded paths
+    if exclude_pattern:
         route_maps.append(RouteMap(
-            pattern=re.compile(pattern),
+            pattern=exclude_pattern,
             mcp_type=MCPType.EXCLUDE
         ))
     
+    # RouteMap tags must all match, so each excluded tag needs its own route map
     for tag in exclude_tags_set:
         route_maps.append(RouteMap(
             tags={tag},
@@ -91,48 +111,56 @@ def _combine_patterns(patterns: List[str]) -> re.Pattern:
     """Combine multiple regex patterns into a single compiled regex pattern using OR logic."""
     if len(patterns) == 1:
         return re.compile(patterns[0])
-    return re.compile("|".join(patterns))
+    # Non-capturing groups keep each alternative self-contained
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
 
 
 def validate_filter_options(
-    methods: Optional[str] = None,
+    methods: Optional[List[str]] = None,
     include_paths: Optional[str] = None,
     exclude_paths: Optional[str] = None,
     include_tags: Optional[str] = None,
     exclude_tags: Optional[str] = None,
-) -> List[str]:
+) -> Tuple[List[str], Dict[str, re.Pattern]]:
     """
-    Validate filter options and return list of errors.
+    Validate filter options and compile the path patterns.
     
     Args:
-        methods: Comma-separated HTTP methods
+        methods: Upper-cased HTTP methods parsed from the CLI
         include_paths: Comma-separated regex patterns to include
         exclude_paths: Comma-separated regex patterns to exclude
         include_tags: Comma-separated tags to include
         exclude_tags: Comma-separated tags to exclude
         
     Returns:
-        List of validation error messages (empty if valid)
+        Tuple of validation error messages (empty if valid) and the compiled
+        "include"/"exclude" path patterns, for reuse by create_route_maps_from_filters
     """
     errors = []
     
     # Validate HTTP methods
     if methods:
-        valid_methods = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
-        method_list = _parse_comma_separated(methods, str.upper)
-        invalid_methods = [m for m in method_list if m not in valid_methods]
+        invalid_methods = set(methods) - _VALID_METHODS
         if invalid_methods:
-            errors.append(f"Invalid HTTP methods: {', '.join(invalid_methods)}. Valid methods: {', '.join(valid_methods)}")
+            errors.append(f"Invalid HTTP methods: {', '.join(sorted(invalid_methods))}. "
+                          f"Valid methods: {', '.join(sorted(_VALID_METHODS))}")
     
-    # Validate regex patterns
+    # Validate regex patterns by compiling each option's combined pattern once
+    compiled_patterns = {}
     for paths, name in [(include_paths, "include"), (exclude_paths, "exclude")]:
         if paths:
-            patterns = _parse_comma_separated(paths)
-            for pattern in patterns:
-                if not _is_valid_regex(pattern):
+            patterns = parse_comma_separated(paths)
+            try:
+                compiled_patterns[name] = _combine_patterns(patterns)
+            except re.error as e:
+                # Only on failure, check patterns individually to report the culprits
+                invalid_patterns = [pattern for pattern in patterns if not _is_valid_regex(pattern)]
+                for pattern in invalid_patterns:
                     errors.append(f"Invalid {name} path pattern: {pattern}")
+                if not invalid_patterns:
+                    errors.append(f"Invalid combined {name} path patterns: {e}")
     
-    return errors
+    return errors, compiled_patterns
 
 
 def _is_valid_regex(pattern: str) -> bool:
@@ -0,0 +1,89 @@
+"""
+On-disk cache for parsed OpenAPI specifications.
+
+Parsed specs are pickled under the user cache directory, one file per spec source. Each entry
+stores a freshness validator (file mtime/size, or HTTP ETag/Last-Modified) ahead of the spec, so
+unchanged specs skip parsing on subsequent starts and a new version overwrites the old entry.
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from . import __version__
+
+logger = logging.getLogger(__name__)
+
+# Set after the first failed write so the warning is only shown once per process
+_write_failure_logged = False
+
+
+def get_cache_dir() -> Path:
+    """Return the directory used for cached specs (honours XDG_CACHE_HOME)."""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'openapi-mcp-server'
+
+
+def _cache_file(source: str) -> Path:
+    """Return the cache file for a spec source (a resolved file path or a URL)."""
+    digest = hashlib.sha1(source.encode('utf-8')).hexdigest()
+    return get_cache_dir() / f"{digest}.pkl"
+
+
+def file_validator(path: Path) -> Optional[Tuple[int, int]]:
+    """Return the freshness validator for a local spec file (mtime and size), or None if uncacheable."""
+    st = path.stat()
+    # Pipes, FIFOs and /proc files have no meaningful mtime/size to validate against
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_cached_spec(source: str, validator: Any) -> Optional[Dict[str, Any]]:
+    """Return the cached spec for a source if its validator matches, otherwise None."""
+    cache_file = _cache_file(source)
+    try:
+        with cache_file.open('rb') as f:
+            # The validator is pickled first so stale entries are rejected without loading the spec
+            if pickle.load(f) != (__version__, validator):
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug("Ignoring unreadable spec cache %s: %s", cache_file, e)
+        return None
+
+
+def store_cached_spec(source: str, validator: Any, spec: Dict[str, Any]) -> None:
+    """Write a parsed spec to the cache, replacing any older version of the same source.
+
+    Failures are logged and otherwise ignored.
+    """
+    cache_dir = get_cache_dir()
+    tmp_name = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so concurrent starts never see a partial pickle
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp', delete=False) as f:
+            tmp_name = f.name
+            pickle.dump((__version__, validator), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, _cache_file(source))
+    except Exception as e:
+        global _write_failure_logged
+        if not _write_failure_logged:
+            logger.warning("Spec cache is not writable, caching disabled (%s: %s); "
+                           "set XDG_CACHE_HOME or pass --no-cache", cache_dir, e)
+            _write_failure_logged = True
+        else:
+            logger.debug("Could not write spec cache in %s: %s", cache_dir, e)
+        if tmp_name:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)